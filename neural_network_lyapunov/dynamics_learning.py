@@ -77,6 +77,9 @@ class DynamicsLearning:
             params_list = self.get_trainable_parameters()
         params = [{'params': p} for p in params_list]
         self.optimizer = torch.optim.Adam(params)
+        if self.writer is not None:
+            # flushes the previous run and stops its writer thread.
+            self.writer.close()
         self.writer = SummaryWriter()
         self.log_suffix = ""
         self.n_iter = 0
@@ -210,120 +213,82 @@ class DynamicsLearning:
         @return lyap_der_loss tensor of the lypunov loss for the derivative
         constraint
         """
-        if self.opt.lyap_loss_warmstart:
+        warmstart = self.opt.lyap_loss_warmstart
+        if self.opt.lyap_pos_loss_weight != 0.:
             lyap_pos_mip, x_var = self.lyap.lyapunov_positivity_as_milp(
                 self.lyap.system.x_equilibrium,
                 self.opt.V_lambda,
                 self.opt.V_eps_pos,
-                x_warmstart=self.lyap_pos_x_adv,
+                x_warmstart=self.lyap_pos_x_adv if warmstart else None,
                 R=self.opt.R)
+            lyap_pos_loss = self._solve_lyapunov_milp(lyap_pos_mip,
+                                                      lyap_pos_threshold)
+            if warmstart:
+                self.lyap_pos_x_adv = torch.tensor([var.X for var in x_var],
+                                                   dtype=self.opt.dtype)
         else:
-            lyap_pos_mip, x_var = self.lyap.lyapunov_positivity_as_milp(
-                self.lyap.system.x_equilibrium,
-                self.opt.V_lambda,
-                self.opt.V_eps_pos,
-                R=self.opt.R)
-        lyap_pos_mip.gurobi_model.setParam(gurobipy.GRB.Param.OutputFlag,
-                                           False)
-        if self.opt.lyap_loss_optimal:
-            lyap_pos_mip.gurobi_model.optimize()
-            lyap_pos_loss = lyap_pos_mip.\
-                compute_objective_from_mip_data_and_solution()
-        else:
-            lyap_pos_mip.gurobi_model.optimize(
-                utils.get_gurobi_terminate_if_callback(
-                    threshold=lyap_pos_threshold))
-            try:
-                lyap_pos_loss = lyap_pos_mip.\
-                    compute_objective_from_mip_data_and_solution()
-            except IncorrectActiveConstraint:
-                print("WARNING: Cannot find the right " +
-                      "constraints to get gradient.")
-                lyap_pos_loss = torch.tensor(0, dtype=self.opt.dtype)
-        if self.opt.lyap_loss_warmstart:
-            self.lyap_pos_x_adv = torch.tensor([var.X for var in x_var],
-                                               dtype=self.opt.dtype)
-
-        if self.opt.lyap_loss_warmstart:
+            lyap_pos_loss = torch.tensor(0, dtype=self.opt.dtype)
+
+        if self.opt.lyap_der_lo_loss_weight != 0.:
             lyap_der_mip_return = self.lyap.lyapunov_derivative_as_milp(
                 self.lyap.system.x_equilibrium,
                 self.opt.V_lambda,
                 self.opt.V_eps_der_lo,
                 lyapunov.ConvergenceEps.ExpLower,
                 R=self.opt.R,
-                x_warmstart=self.lyap_der_lo_x_adv)
+                x_warmstart=self.lyap_der_lo_x_adv if warmstart else None)
+            lyap_der_lo_loss = self._solve_lyapunov_milp(
+                lyap_der_mip_return.milp, lyap_der_lo_threshold)
+            if warmstart:
+                self.lyap_der_lo_x_adv = torch.tensor(
+                    [var.X for var in lyap_der_mip_return.x],
+                    dtype=self.opt.dtype)
         else:
-            lyap_der_mip_return = self.lyap.lyapunov_derivative_as_milp(
-                self.lyap.system.x_equilibrium,
-                self.opt.V_lambda,
-                self.opt.V_eps_der_lo,
-                lyapunov.ConvergenceEps.ExpLower,
-                R=self.opt.R)
-        lyap_der_mip = lyap_der_mip_return.milp
-        x_var = lyap_der_mip_return.x
-        lyap_der_mip.gurobi_model.setParam(gurobipy.GRB.Param.OutputFlag,
-                                           False)
-        if self.opt.lyap_loss_optimal:
-            lyap_der_mip.gurobi_model.optimize()
-            lyap_der_lo_loss = lyap_der_mip.\
-                compute_objective_from_mip_data_and_solution()
-        else:
-            lyap_der_mip.gurobi_model.optimize(
-                utils.get_gurobi_terminate_if_callback(
-                    threshold=lyap_der_lo_threshold))
-            try:
-                lyap_der_lo_loss = lyap_der_mip.\
-                    compute_objective_from_mip_data_and_solution()
-            except IncorrectActiveConstraint:
-                print("WARNING: Cannot find the right " +
-                      "constraints to get gradient.")
-                lyap_der_lo_loss = torch.tensor(0, dtype=self.opt.dtype)
-        if self.opt.lyap_loss_warmstart:
-            self.lyap_der_lo_x_adv = torch.tensor([var.X for var in x_var],
-                                                  dtype=self.opt.dtype)
-
-        if self.opt.lyap_loss_warmstart:
+            lyap_der_lo_loss = torch.tensor(0, dtype=self.opt.dtype)
+
+        if self.opt.lyap_der_up_loss_weight != 0.:
             lyap_der_mip_return = self.lyap.lyapunov_derivative_as_milp(
                 self.lyap.system.x_equilibrium,
                 self.opt.V_lambda,
                 self.opt.V_eps_der_up,
                 lyapunov.ConvergenceEps.ExpUpper,
                 R=self.opt.R,
-                x_warmstart=self.lyap_der_up_x_adv)
+                x_warmstart=self.lyap_der_up_x_adv if warmstart else None)
+            lyap_der_up_loss = self._solve_lyapunov_milp(
+                lyap_der_mip_return.milp, lyap_der_up_threshold)
+            if warmstart:
+                self.lyap_der_up_x_adv = torch.tensor(
+                    [var.X for var in lyap_der_mip_return.x],
+                    dtype=self.opt.dtype)
         else:
-            lyap_der_mip_return = self.lyap.lyapunov_derivative_as_milp(
-                self.lyap.system.x_equilibrium,
-                self.opt.V_lambda,
-                self.opt.V_eps_der_up,
-                lyapunov.ConvergenceEps.ExpUpper,
-                R=self.opt.R)
-        lyap_der_mip = lyap_der_mip_return.milp
-        x_var = lyap_der_mip_return.x
-        lyap_der_mip.gurobi_model.setParam(gurobipy.GRB.Param.OutputFlag,
-                                           False)
-        if self.opt.lyap_loss_optimal:
-            lyap_der_mip.gurobi_model.optimize()
-            lyap_der_up_loss = lyap_der_mip.\
-                compute_objective_from_mip_data_and_solution()
-        else:
-            lyap_der_mip.gurobi_model.optimize(
-                utils.get_gurobi_terminate_if_callback(
-                    threshold=lyap_der_up_threshold))
-            try:
-                lyap_der_up_loss = lyap_der_mip.\
-                    compute_objective_from_mip_data_and_solution()
-            except IncorrectActiveConstraint:
-                print("WARNING: Cannot find the right " +
-                      "constraints to get gradient.")
-                lyap_der_up_loss = torch.tensor(0, dtype=self.opt.dtype)
-        if self.opt.lyap_loss_warmstart:
-            self.lyap_der_up_x_adv = torch.tensor([var.X for var in x_var],
-                                                  dtype=self.opt.dtype)
+            lyap_der_up_loss = torch.tensor(0, dtype=self.opt.dtype)
 
         return (self.opt.lyap_pos_loss_weight * lyap_pos_loss,
                 self.opt.lyap_der_lo_loss_weight * lyap_der_lo_loss,
                 self.opt.lyap_der_up_loss_weight * lyap_der_up_loss)
 
+    def _solve_lyapunov_milp(self, milp, threshold):
+        """
+        solves one of the lyapunov MILPs and returns its objective
+        @param milp GurobiTorchMILP instance
+        @param threshold float, unless lyap_loss_optimal is set, the MILP is
+        terminated when its objective reaches threshold
+        @return tensor of the objective, differentiable w.r.t. the parameters
+        of the networks
+        """
+        milp.gurobi_model.setParam(gurobipy.GRB.Param.OutputFlag, False)
+        if self.opt.lyap_loss_optimal:
+            milp.gurobi_model.optimize()
+            return milp.compute_objective_from_mip_data_and_solution()
+        milp.gurobi_model.optimize(
+            utils.get_gurobi_terminate_if_callback(threshold=threshold))
+        try:
+            return milp.compute_objective_from_mip_data_and_solution()
+        except IncorrectActiveConstraint:
+            print("WARNING: Cannot find the right " +
+                  "constraints to get gradient.")
+            return torch.tensor(0, dtype=self.opt.dtype)
+
     def lyapunov_loss_at_samples(self, x_all, x_lo, x_up):
         """
         computes lyapunov loss at the provided samples
@@ -344,20 +309,26 @@ class DynamicsLearning:
                 x_all.device)
             return sample_pos_loss, sample_der_lo_loss, sample_der_up_loss
         x_next = self.lyap.system.step_forward(x)
+        # ReLU(x*) is shared by the three losses, compute it only once.
+        relu_at_equilibrium = self.lyap.lyapunov_relu(
+            self.lyap.system.x_equilibrium)
         sample_pos_loss = \
             self.lyap.lyapunov_positivity_loss_at_samples(
                 self.lyap.system.x_equilibrium, x,
-                self.opt.V_lambda, self.opt.V_eps_pos, R=self.opt.R)
+                self.opt.V_lambda, self.opt.V_eps_pos, R=self.opt.R,
+                relu_at_equilibrium=relu_at_equilibrium)
         sample_der_lo_loss = \
             self.lyap.lyapunov_derivative_loss_at_samples_and_next_states(
                 self.opt.V_lambda, self.opt.V_eps_der_lo, x, x_next,
                 self.lyap.system.x_equilibrium,
-                lyapunov.ConvergenceEps.ExpLower, R=self.opt.R)
+                lyapunov.ConvergenceEps.ExpLower, R=self.opt.R,
+                relu_at_equilibrium=relu_at_equilibrium)
         sample_der_up_loss = \
             self.lyap.lyapunov_derivative_loss_at_samples_and_next_states(
                 self.opt.V_lambda, self.opt.V_eps_der_up, x, x_next,
                 self.lyap.system.x_equilibrium,
-                lyapunov.ConvergenceEps.ExpUpper, R=self.opt.R)
+                lyapunov.ConvergenceEps.ExpUpper, R=self.opt.R,
+                relu_at_equilibrium=relu_at_equilibrium)
         return (self.opt.lyap_pos_loss_at_samples_weight * sample_pos_loss,
                 self.opt.lyap_der_lo_loss_at_samples_weight *
                 sample_der_lo_loss,
@@ -367,18 +338,18 @@ class DynamicsLearning:
     def rollout_validation(self, rollouts, device='cpu'):
         """
         computes the mean loss along a list of rollouts
-        @param rollouts list of tensors, each one of them a rollout
+        @param rollouts list of tensors, each one of them a rollout, all of
+        the same length
         @param device where to run the computation (e.g. 'cuda')
         """
         assert (isinstance(rollouts, list))
         assert (len(rollouts) >= 1)
         self.all_to_device(device)
-        validation_loss = torch.zeros(rollouts[0].shape[0],
-                                      dtype=self.opt.dtype).to(device)
         with torch.no_grad():
-            for rollout_expected in rollouts:
-                rollout_expected = rollout_expected.to(device)
-                validation_loss += self.rollout_loss(rollout_expected)
+            # all the rollouts are simulated together as one batch
+            rollouts_expected = torch.stack(rollouts).to(device)
+            validation_loss = self.batch_rollout_loss(
+                rollouts_expected).sum(dim=0)
         self.all_to_device('cpu')
         validation_loss = validation_loss.to('cpu')
         return validation_loss
@@ -391,6 +362,17 @@ class DynamicsLearning:
             else:
                 self.writer.add_scalar(name, value, self.n_iter)
 
+    def log_all(self, names, values):
+        """
+        logs several scalar tensors at once, with a single copy to the host
+        @param names list of string names
+        @param values list of scalar tensors, on the same device
+        """
+        if self.writer is not None:
+            values = torch.cat([v.detach().reshape(-1) for v in values])
+            for name, value in zip(names, values.tolist()):
+                self.log(name, value)
+
     def train(self,
               num_epoch,
               validate=False,
@@ -411,14 +393,18 @@ class DynamicsLearning:
         @param save_path string path where to save the models
         """
         self.all_to_device(device)
+        if torch.device(device).type == 'cuda':
+            # the batch shapes are fixed, let cudnn pick the fastest conv
+            # algorithms once and reuse them
+            torch.backends.cudnn.benchmark = True
         if self.optimizer is None:
             self.reset_optimizer()
         try:
             for epoch_i in range(num_epoch):
                 self.log_suffix = "train"
                 for x, x_next in self.train_dataloader:
-                    x = x.to(device)
-                    x_next = x_next.to(device)
+                    x = x.to(device, non_blocking=True)
+                    x_next = x_next.to(device, non_blocking=True)
                     self.optimizer.zero_grad()
                     dyn_loss = self.dynamics_loss(x, x_next)
                     (lyap_pos_loss_at_samples,
@@ -431,12 +417,13 @@ class DynamicsLearning:
                         lyap_der_up_loss_at_samples
                     loss.backward()
                     self.optimizer.step()
-                    self.log('Dynamics', dyn_loss)
-                    self.log('LyapunovPosSamples', lyap_pos_loss_at_samples)
-                    self.log('LyapunovDerSamples/low',
-                             lyap_der_lo_loss_at_samples)
-                    self.log('LyapunovDerSamples/up',
-                             lyap_der_up_loss_at_samples)
+                    # a single device to host copy for all the logged losses
+                    self.log_all(
+                        ('Dynamics', 'LyapunovPosSamples',
+                         'LyapunovDerSamples/low', 'LyapunovDerSamples/up'),
+                        (dyn_loss, lyap_pos_loss_at_samples,
+                         lyap_der_lo_loss_at_samples,
+                         lyap_der_up_loss_at_samples))
                     if ((self.opt.lyap_loss_freq > 0) and
                             ((self.n_iter % self.opt.lyap_loss_freq) == 0)):
                         with torch.no_grad():
@@ -444,11 +431,12 @@ class DynamicsLearning:
                              lyap_der_lo_loss_at_samples,
                              lyap_der_up_loss_at_samples) =\
                                 self.lyapunov_loss_at_samples(x)
-                        lyap_pos_threshold = lyap_pos_loss_at_samples.item()
-                        lyap_der_lo_threshold = lyap_der_lo_loss_at_samples.\
-                            item()
-                        lyap_der_up_threshold = lyap_der_up_loss_at_samples.\
-                            item()
+                        thresholds = torch.cat(
+                            (lyap_pos_loss_at_samples.reshape(-1),
+                             lyap_der_lo_loss_at_samples.reshape(-1),
+                             lyap_der_up_loss_at_samples.reshape(-1)))
+                        (lyap_pos_threshold, lyap_der_lo_threshold,
+                         lyap_der_up_threshold) = thresholds.tolist()
                         self.optimizer.zero_grad()
                         self.lyapunov_to_device('cpu')
                         lyap_pos_loss, lyap_der_lo_loss, lyap_der_up_loss =\
@@ -458,9 +446,9 @@ class DynamicsLearning:
                                 lyap_der_up_threshold=lyap_der_up_threshold)
                         loss = (lyap_pos_loss + lyap_der_lo_loss +
                                 lyap_der_up_loss)
-                        loss.backward()
+                        if loss.requires_grad:
+                            loss.backward()
                         self.lyapunov_to_device(device)
-                        loss = loss.to(device)
                         self.optimizer.step()
                         self.log('LyapunovPos', lyap_pos_loss)
                         self.log('LyapunovDer/low', lyap_der_lo_loss)
@@ -475,8 +463,8 @@ class DynamicsLearning:
                         lyap_der_up_loss_at_samples = 0.
                         n_samples = 0.
                         for x, x_next in self.validation_dataloader:
-                            x = x.to(device)
-                            x_next = x_next.to(device)
+                            x = x.to(device, non_blocking=True)
+                            x_next = x_next.to(device, non_blocking=True)
                             dyn_loss_ = self.dynamics_loss(x, x_next)
                             (lyap_pos_loss_at_samples_,
                              lyap_der_lo_loss_at_samples_,
@@ -586,25 +574,18 @@ class StateSpaceDynamicsLearning(DynamicsLearning):
         """
         assert (len(x_init.shape) == 1)
         assert (x_init.shape[0] == self.opt.x_dim)
-        x_traj = torch.zeros(N + 1, self.opt.x_dim,
-                             dtype=self.opt.dtype).to(x_init.device)
-        V_traj = []
+        x_traj = torch.empty(N + 1, self.opt.x_dim,
+                             dtype=self.opt.dtype, device=x_init.device)
         x_traj[0, :] = x_init
-        V_traj.append(
-            self.lyap.lyapunov_value(x_init,
-                                     self.lyap.system.x_equilibrium,
-                                     self.opt.V_lambda,
-                                     R=self.opt.R).item())
-        for n in range(N):
-            with torch.no_grad():
-                x_next_pred = self.lyap.system.step_forward(x_traj[n, :])
-                x_traj[n + 1, :] = x_next_pred
-                V_traj.append(
-                    self.lyap.lyapunov_value(x_next_pred,
-                                             self.lyap.system.x_equilibrium,
-                                             self.opt.V_lambda,
-                                             R=self.opt.R).item())
-        V_traj = torch.tensor(V_traj, dtype=self.opt.dtype)
+        with torch.no_grad():
+            for n in range(N):
+                x_traj[n + 1, :] = self.lyap.system.step_forward(x_traj[n, :])
+            # evaluates the lyapunov function on the whole rollout at once
+            V_traj = self.lyap.lyapunov_value(x_traj,
+                                              self.lyap.system.x_equilibrium,
+                                              self.opt.V_lambda,
+                                              R=self.opt.R).reshape(-1)
+        V_traj = V_traj.to('cpu')
         return x_traj, V_traj
 
     def rollout_loss(self, rollout_expected):
@@ -616,7 +597,24 @@ class StateSpaceDynamicsLearning(DynamicsLearning):
         """
         x0 = rollout_expected[0, :]
         rollout_pred, _ = self.rollout(x0, rollout_expected.shape[0] - 1)
-        loss = (rollout_expected - rollout_pred).pow(2).mean(dim=[1])
+        err = rollout_expected - rollout_pred
+        loss = (err * err).mean(dim=[1])
+        return loss
+
+    def batch_rollout_loss(self, rollouts_expected):
+        """
+        same as rollout_loss, for a batch of rollouts simulated together
+        @param rollouts_expected tensor [num_rollouts, N+1, x_dim]
+        @return loss tensor of dim [num_rollouts, N+1]
+        """
+        x_traj = torch.empty_like(rollouts_expected)
+        x_traj[:, 0, :] = rollouts_expected[:, 0, :]
+        with torch.no_grad():
+            for n in range(rollouts_expected.shape[1] - 1):
+                x_traj[:, n + 1, :] = self.lyap.system.step_forward(
+                    x_traj[:, n, :])
+        err = rollouts_expected - x_traj
+        loss = (err * err).mean(dim=[2])
         return loss
 
 
@@ -643,6 +641,9 @@ class LatentSpaceDynamicsLearning(DynamicsLearning):
         self.decoded_equilibrium = decoded_equilibrium
         self.bce_loss = nn.BCELoss(reduction='mean')
         self.bce_loss_none = nn.BCELoss(reduction='none')
+        self.mse_loss = nn.MSELoss(reduction='mean')
+        # memory format of the images fed to the encoder, see all_to_device
+        self.memory_format = torch.contiguous_format
 
     def get_trainable_parameters(self):
         """
@@ -661,8 +662,14 @@ class LatentSpaceDynamicsLearning(DynamicsLearning):
         moves all the relevant parameters to device (e.g. 'cpu', 'cuda')
         """
         self.lyapunov_to_device(device)
-        self.encoder.to(device)
-        self.decoder.to(device)
+        # the conv layers run faster in NHWC (channels_last) with cudnn,
+        # on CPU we keep the default layout
+        if torch.device(device).type == 'cuda':
+            self.memory_format = torch.channels_last
+        else:
+            self.memory_format = torch.contiguous_format
+        self.encoder.to(device, memory_format=self.memory_format)
+        self.decoder.to(device, memory_format=self.memory_format)
         if self.decoded_equilibrium is not None:
             self.decoded_equilibrium = self.decoded_equilibrium.to(device)
 
@@ -711,7 +718,7 @@ class LatentSpaceDynamicsLearning(DynamicsLearning):
         @return a sample z in latent space, as a tensor
         """
         z_std = torch.exp(0.5 * z_log_var)
-        eps = torch.randn(z_mu.shape, dtype=z_mu.dtype).to(z_mu.device)
+        eps = torch.randn_like(z_mu)
         z = eps * z_std + z_mu
         return z
 
@@ -727,7 +734,8 @@ class LatentSpaceDynamicsLearning(DynamicsLearning):
         @return z_log_var tensor, log of the variance of the latent samples
         (if VAE) otherwise just None
         """
-        z_mu, z_log_var = self.encoder(x)
+        z_mu, z_log_var = self.encoder(
+            x.contiguous(memory_format=self.memory_format))
         if self.opt.use_variational:
             z = self.reparam(z_mu, z_log_var)
         else:
@@ -744,7 +752,8 @@ class LatentSpaceDynamicsLearning(DynamicsLearning):
         the samples and then calls the function of the same name in the
         parent class DynamicsLearning
         """
-        z_mu, z_log_var = self.encoder(x)
+        z_mu, z_log_var = self.encoder(
+            x.contiguous(memory_format=self.memory_format))
         if self.opt.use_variational:
             z = self.reparam(z_mu, z_log_var)
         else:
@@ -761,8 +770,7 @@ class LatentSpaceDynamicsLearning(DynamicsLearning):
         @return weighted KL divergence
         """
         loss = torch.mean(-.5 * torch.sum(
-            -torch.pow(z_mu, 2) - torch.exp(z_log_var) + z_log_var + 1.,
-            dim=1))
+            -z_mu * z_mu - torch.exp(z_log_var) + z_log_var + 1., dim=1))
         weighted_loss = self.kl_loss_weight(self.n_iter) * loss
         self.log("KL/original", loss)
         self.log("KL/weighted", weighted_loss)
@@ -778,7 +786,7 @@ class LatentSpaceDynamicsLearning(DynamicsLearning):
         if self.opt.use_bce:
             loss = self.bce_loss(x_decoded, x)
         else:
-            loss = (x - x_decoded).pow(2).mean(dim=[1, 2, 3])[0]
+            loss = self.mse_loss(x_decoded, x)
         return loss
 
     def dynamics_loss(self, x, x_next):
@@ -824,16 +832,19 @@ class LatentSpaceDynamicsLearning(DynamicsLearning):
         """
         assert (len(x_init.shape) == 3)
         num_channels = int(x_init.shape[0] / 2)
-        x_traj = torch.zeros(N + 2,
+        x_traj = torch.empty(N + 2,
                              num_channels,
                              x_init.shape[1],
                              x_init.shape[2],
-                             dtype=self.opt.dtype).to(x_init.device)
+                             dtype=self.opt.dtype,
+                             device=x_init.device)
         x_traj[0, :] = x_init[:num_channels, :, :]
         x_traj[1, :] = x_init[num_channels:, :, :]
         z_traj = []
         V_traj = []
-        z_traj.append(self.encoder(x_init.unsqueeze(0))[0])
+        z_traj.append(
+            self.encoder(x_init.unsqueeze(0).contiguous(
+                memory_format=self.memory_format))[0])
         V_traj.append(
             self.lyap.lyapunov_value(z_traj[-1].squeeze(),
                                      self.lyap.system.x_equilibrium,
@@ -852,11 +863,12 @@ class LatentSpaceDynamicsLearning(DynamicsLearning):
                             self.opt.V_lambda,
                             R=self.opt.R).item())
                 else:
+                    # frames n and n+1 are adjacent in x_traj, so stacking
+                    # them along the channels is a view, not a copy
                     _, x_next_pred_decoded, _, _, z_next =\
-                        self.vae_forward(
-                            torch.cat(
-                                (x_traj[n, :], x_traj[n+1, :]),
-                                dim=0).unsqueeze(0))
+                        self.vae_forward(x_traj[n:n + 2].reshape(
+                            1, 2 * num_channels, x_init.shape[1],
+                            x_init.shape[2]))
                     x_traj[n+2, :] =\
                         x_next_pred_decoded[0, num_channels:, :, :]
                     z_traj.append(z_next)
@@ -886,5 +898,33 @@ class LatentSpaceDynamicsLearning(DynamicsLearning):
             loss = self.bce_loss_none(rollout_expected,
                                       rollout_pred).mean(dim=[1, 2, 3])
         else:
-            loss = (rollout_expected - rollout_pred).pow(2).mean(dim=[1, 2, 3])
+            err = rollout_expected - rollout_pred
+            loss = (err * err).mean(dim=[1, 2, 3])
+        return loss
+
+    def batch_rollout_loss(self, rollouts_expected):
+        """
+        same as rollout_loss (without decode_intermediate), for a batch of
+        rollouts simulated together
+        @param rollouts_expected tensor [num_rollouts, N+2, num_channels,
+        width, height]
+        @return loss tensor of dim [num_rollouts, N+2]
+        """
+        num_rollouts, _, num_channels, width, height = rollouts_expected.shape
+        x_traj = torch.empty_like(rollouts_expected)
+        x_traj[:, :2] = rollouts_expected[:, :2]
+        with torch.no_grad():
+            z, _ = self.encoder(
+                rollouts_expected[:, :2].reshape(
+                    num_rollouts, 2 * num_channels, width,
+                    height).contiguous(memory_format=self.memory_format))
+            for n in range(rollouts_expected.shape[1] - 2):
+                z = self.lyap.system.step_forward(z)
+                x_traj[:, n + 2] = self.decoder(z)[:, num_channels:, :, :]
+        if self.opt.use_bce:
+            loss = self.bce_loss_none(rollouts_expected,
+                                      x_traj).mean(dim=[2, 3, 4])
+        else:
+            err = rollouts_expected - x_traj
+            loss = (err * err).mean(dim=[2, 3, 4])
         return loss
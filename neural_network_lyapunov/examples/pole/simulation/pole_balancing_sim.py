@@ -1,6 +1,7 @@
 import numpy as np
 import os
 import torch
+import functools
 
 from pydrake.all import (AddMultibodyPlantSceneGraph, ConnectMeshcatVisualizer,
                          Simulator, RigidTransform, Parser,
@@ -21,6 +22,39 @@ models_dir = os.path.join(os.path.join(
     os.path.dirname(os.path.dirname(__file__)), 'simulation'), 'models')
 
 
+# Parameters of the ball and plate system, and the force on the plate that
+# keeps the system at the upright equilibrium.
+POLE_LENGTH = 0.82
+BALL_MASS = 0.1649
+PLATE_MASS = 0.2
+GRAVITY = 9.81
+U_EQ = np.array([0, 0, (BALL_MASS + PLATE_MASS) * GRAVITY])
+
+
+@functools.lru_cache(maxsize=None)
+def lqr_around_upright_equilibrium():
+    """
+    Linearizes the pole dynamics around the upright equilibrium and computes
+    the LQR gain. Everything here only depends on constants, so the result is
+    computed once and shared by all the LQRController instances. The
+    returned arrays are read-only, callers take a copy to modify them.
+    @return (A, B, Q, R, K)
+    """
+    pole = Pole(BALL_MASS, PLATE_MASS, POLE_LENGTH)
+    x0 = torch.tensor(np.zeros(7), dtype=pole.dtype)
+    u0 = torch.tensor(U_EQ, dtype=pole.dtype)
+    A, B = pole.gradient(x0, u0)
+    A = A.detach().numpy()
+    B = B.detach().numpy()
+    Q = np.diag([10, 10, 1, 1, 1, 10, 10])
+    R = np.eye(3)
+    K, _ = LinearQuadraticRegulator(A, B, Q, R)
+    K = np.ascontiguousarray(K, dtype=np.float64)
+    for mat in (A, B, Q, R, K):
+        mat.flags.writeable = False
+    return A, B, Q, R, K
+
+
 def render_system_with_graphviz(system, output_file="system_view.gz"):
     """ Renders the Drake system (presumably a diagram,
     otherwise this graph will be fairly trivial) using
@@ -68,23 +102,22 @@ class LQRController(LeafSystem):
         self.context = plant.CreateDefaultContext()
         self.ball_index = int(plant.GetBodyByName("ball").index())
         self.plate_index = int(plant.GetBodyByName("box").index())
-        self.length = 0.82
-        self.ms = 0.1649
-        self.me = 0.2
-        self.g = 9.81
-        self.u_eq = np.array([0, 0, (self.ms + self.me) * self.g])
+        self.length = POLE_LENGTH
+        self.ms = BALL_MASS
+        self.me = PLATE_MASS
+        self.g = GRAVITY
+        self.u_eq = U_EQ.copy()
         self.u_dim = 3
-        # Linearization around the upright equilibrium
-        pole = Pole(self.ms, self.me, self.length)
-        x0 = torch.tensor(np.zeros(7), dtype=pole.dtype)
-        u0 = torch.tensor(self.u_eq, dtype=pole.dtype)
-        A, B = pole.gradient(x0, u0)
-        self.A = A.detach().numpy()
-        self.B = B.detach().numpy()
-        self.Q = np.diag([10, 10, 1, 1, 1, 10, 10])
-        self.R = np.eye(3)
-        self.K, _ = LinearQuadraticRegulator(
-            self.A, self.B, self.Q, self.R)
+        # Linearization around the upright equilibrium, copied so that each
+        # controller owns its matrices.
+        self.A, self.B, self.Q, self.R, self.K = [
+            mat.copy() for mat in lqr_around_upright_equilibrium()
+        ]
+        # Buffers reused by CalculateController, which is called at every
+        # simulation step.
+        self._K_neg = -self.K
+        self._x = np.empty(self.K.shape[1])
+        self._u = np.empty(self.u_dim)
 
         self.body_pose_input_port = self.DeclareAbstractInputPort(
             "body_pose", AbstractValue.Make([RigidTransform()]))
@@ -96,20 +129,22 @@ class LQRController(LeafSystem):
 
     def CalculateController(self, context, output):
         pose = self.body_pose_input_port.Eval(context)
-        ball_pose = pose[self.ball_index]
-        plate_pose = pose[self.plate_index]
         velocity = self.body_velocity_input_port.Eval(context)
-        ball_velocity = velocity[self.ball_index]
-        plate_velocity = velocity[self.plate_index]
-        x_B, y_B, _ = ball_pose.translation()
-        x_A, y_A, _ = plate_pose.translation()
-        xd_B, yd_B, _ = ball_velocity.translational()
-        xd_A, yd_A, zd_A = plate_velocity.translational()
-        x = np.array([x_B - x_A, y_B - y_A, xd_A, yd_A,
-                      zd_A, xd_B - xd_A, yd_B - yd_A])
-
-        u = output.get_mutable_value()
-        u[:] = -self.K @ x + self.u_eq
+        p_B = pose[self.ball_index].translation()
+        p_A = pose[self.plate_index].translation()
+        v_B = velocity[self.ball_index].translational()
+        v_A = velocity[self.plate_index].translational()
+        # x = [x_B - x_A, y_B - y_A, xd_A, yd_A, zd_A, xd_B - xd_A,
+        #      yd_B - yd_A]
+        x = self._x
+        np.subtract(p_B[:2], p_A[:2], out=x[0:2])
+        x[2:5] = v_A
+        np.subtract(v_B[:2], v_A[:2], out=x[5:7])
+
+        # u = -K * x + u_eq
+        np.dot(self._K_neg, x, out=self._u)
+        self._u += self.u_eq
+        output.get_mutable_value()[:] = self._u
 
 
 class IiwaController(LeafSystem):
@@ -157,7 +157,13 @@ class LyapunovHybridLinearSystem:
                 alpha[i] = alpha_i
         return (s, alpha)
 
-    def lyapunov_value(self, x, x_equilibrium, V_lambda, *, R=None):
+    def lyapunov_value(self,
+                       x,
+                       x_equilibrium,
+                       V_lambda,
+                       *,
+                       R=None,
+                       relu_at_equilibrium=None):
         """
         Compute the value of the Lyapunov function as
         V(x) = ReLU(x) - ReLU(x*) + λ|R*(x-x*)|₁
@@ -168,9 +174,13 @@ class LyapunovHybridLinearSystem:
         @param V_lambda λ in the documentation above.
         @param R R in the documentation above. It should be a full column rank
         matrix. If R=None, then we use identity as R.
+        @param relu_at_equilibrium ReLU(x*). If None, it is computed here.
+        Callers evaluating V several times with the same network can pass it
+        in to avoid repeating the forward pass.
         """
         R = _get_R(R, self.system.x_dim, x_equilibrium.device)
-        relu_at_equilibrium = self.lyapunov_relu.forward(x_equilibrium)
+        if relu_at_equilibrium is None:
+            relu_at_equilibrium = self.lyapunov_relu.forward(x_equilibrium)
         if x.shape == (self.system.x_dim, ):
             # A single state.
             return self.lyapunov_relu.forward(x) - relu_at_equilibrium +\
@@ -311,7 +321,8 @@ class LyapunovHybridLinearSystem:
                                             R,
                                             margin=0.,
                                             reduction="mean",
-                                            weight=None):
+                                            weight=None,
+                                            relu_at_equilibrium=None):
         """
         We will sample a state xⁱ, and we would like the Lyapunov function to
         be larger than 0 at xⁱ. Hence we define the loss as
@@ -332,6 +343,7 @@ class LyapunovHybridLinearSystem:
         every sample. Otherwise weight should be a vector of the same length
         as the number of samples, whereh weight[i] is the weight of
         state_samples[i].
+        @param relu_at_equilibrium ReLU(x*), see lyapunov_value().
         """
         assert (isinstance(state_samples, torch.Tensor))
         assert (state_samples.shape[1] == self.system.x_dim)
@@ -342,8 +354,8 @@ class LyapunovHybridLinearSystem:
         assert (reduction in {"mean", "max", "4norm"})
         R = _get_R(R, self.system.x_dim, state_samples.device)
         loss = self.lyapunov_value(
-            state_samples, x_equilibrium, V_lambda,
-            R=R) - epsilon * torch.norm(
+            state_samples, x_equilibrium, V_lambda, R=R,
+            relu_at_equilibrium=relu_at_equilibrium) - epsilon * torch.norm(
                 R @ (state_samples - x_equilibrium).T, p=1, dim=0)
         if reduction == "mean":
             if weight is not None:
@@ -999,7 +1011,8 @@ class LyapunovDiscreteTimeHybridSystem(LyapunovHybridLinearSystem):
             R,
             margin=0.,
             reduction="mean",
-            weight=None):
+            weight=None,
+            relu_at_equilibrium=None):
         """
         We will sample states xⁱ, i=1,...N, and we would like the Lyapunov
         function to decrease on these sampled states xⁱ. We denote l(x) as the
@@ -1030,6 +1043,7 @@ class LyapunovDiscreteTimeHybridSystem(LyapunovHybridLinearSystem):
         every sample. Otherwise weight should be a vector of the same length
         as the number of samples, whereh weight[i] is the weight of
         state_samples[i].
+        @param relu_at_equilibrium ReLU(x*), see lyapunov_value().
         @return loss The loss
         mean(max(V(xⁱ[n+1]) - V(xⁱ[n]) + ε*V(xⁱ[n]) + margin, 0))
         """
@@ -1043,8 +1057,18 @@ class LyapunovDiscreteTimeHybridSystem(LyapunovHybridLinearSystem):
         assert (isinstance(eps_type, ConvergenceEps))
         assert (reduction in {"mean", "max", "4norm"})
         R = _get_R(R, self.system.x_dim, state_samples.device)
-        v1 = self.lyapunov_value(state_samples, x_equilibrium, V_lambda, R=R)
-        v2 = self.lyapunov_value(state_next, x_equilibrium, V_lambda, R=R)
+        if relu_at_equilibrium is None:
+            relu_at_equilibrium = self.lyapunov_relu.forward(x_equilibrium)
+        v1 = self.lyapunov_value(state_samples,
+                                 x_equilibrium,
+                                 V_lambda,
+                                 R=R,
+                                 relu_at_equilibrium=relu_at_equilibrium)
+        v2 = self.lyapunov_value(state_next,
+                                 x_equilibrium,
+                                 V_lambda,
+                                 R=R,
+                                 relu_at_equilibrium=relu_at_equilibrium)
 
         if eps_type == ConvergenceEps.ExpLower:
             hinge_loss_all = torch.nn.HingeEmbeddingLoss(
@@ -351,6 +351,15 @@ def compute_range_by_lp(A: np.ndarray, b: np.ndarray, x_lb: np.ndarray,
     assert (isinstance(d, np.ndarray) or d is None)
 
     if (C is None and d is None):
+        if x_lb is not None and x_ub is not None and np.all(
+                np.isfinite(x_lb)) and np.all(
+                    np.isfinite(x_ub)) and np.all(x_lb <= x_ub):
+            # Without C * x <= d the LP optimum is attained at a vertex of
+            # the box, which is the IA bound, so skip the LPs.
+            y_lb, y_ub = compute_range_by_IA(
+                *[torch.tensor(v, dtype=torch.float64)
+                  for v in (A, b, x_lb, x_ub)])
+            return (y_lb.numpy(), y_ub.numpy())
         warnings.warn(
             "Compute_range_by_lp with empty C*x<=d constraint. This is the "
             "same as calling compute_range_by_IA")
@@ -364,47 +373,47 @@ def compute_range_by_lp(A: np.ndarray, b: np.ndarray, x_lb: np.ndarray,
     y_lb = np.empty(y_dim)
     y_ub = np.empty(y_dim)
     model = gurobipy.Model()
+    model.setParam(gurobipy.GRB.Param.OutputFlag, False)
+    # Only the objective changes between the LPs, so the previous optimal
+    # basis stays primal feasible, and primal simplex can warm start from it.
+    model.setParam(gurobipy.GRB.Param.Method, 0)
     x = model.addMVar(x_dim, lb=x_lb, ub=x_ub)
     if C is not None:
         model.addMConstr(C, x, gurobipy.GRB.LESS_EQUAL, d)
+    optimal = gurobipy.GRB.Status.OPTIMAL
+    # The bounds reported for an infeasible or unbounded LP.
+    y_ub_not_optimal = {
+        gurobipy.GRB.Status.INFEASIBLE: -np.inf,
+        gurobipy.GRB.Status.UNBOUNDED: np.inf
+    }
+    y_lb_not_optimal = {
+        gurobipy.GRB.Status.INFEASIBLE: np.inf,
+        gurobipy.GRB.Status.UNBOUNDED: -np.inf
+    }
     for i in range(y_dim):
+        # The objective A[i] * x + b[i] is linear, set it through the Obj
+        # attribute of x, and then only flip the sense between the two LPs.
+        x.Obj = A[i]
+        model.ObjCon = b[i]
         # First find the upper bound.
-        model.setMObjective(Q=None,
-                            c=A[i],
-                            constant=b[i],
-                            xQ_L=None,
-                            xQ_R=None,
-                            xc=x,
-                            sense=gurobipy.GRB.MAXIMIZE)
-        model.update()
-        model.setParam(gurobipy.GRB.Param.OutputFlag, False)
+        model.ModelSense = gurobipy.GRB.MAXIMIZE
         model.optimize()
-        if model.status == gurobipy.GRB.Status.OPTIMAL:
+        status = model.status
+        if status == optimal:
             y_ub[i] = model.ObjVal
-        elif model.status == gurobipy.GRB.Status.INFEASIBLE:
-            y_ub[i] = -np.inf
-        elif model.status == gurobipy.GRB.Status.UNBOUNDED:
-            y_ub[i] = np.inf
+        elif status in y_ub_not_optimal:
+            y_ub[i] = y_ub_not_optimal[status]
         else:
             raise Exception("compute_range_by_lp: unknown status.")
 
         # Now find the lower bound.
-        model.setMObjective(Q=None,
-                            c=A[i],
-                            constant=b[i],
-                            xQ_L=None,
-                            xQ_R=None,
-                            xc=x,
-                            sense=gurobipy.GRB.MINIMIZE)
-        model.update()
-        model.setParam(gurobipy.GRB.Param.OutputFlag, False)
+        model.ModelSense = gurobipy.GRB.MINIMIZE
         model.optimize()
-        if model.status == gurobipy.GRB.Status.OPTIMAL:
+        status = model.status
+        if status == optimal:
             y_lb[i] = model.ObjVal
-        elif model.status == gurobipy.GRB.Status.INFEASIBLE:
-            y_lb[i] = np.inf
-        elif model.status == gurobipy.GRB.Status.UNBOUNDED:
-            y_lb[i] = -np.inf
+        elif status in y_lb_not_optimal:
+            y_lb[i] = y_lb_not_optimal[status]
         else:
             raise Exception("compute_range_by_lp: unknown status.")
     return (y_lb, y_ub)
@@ -427,16 +436,22 @@ def compute_range_by_IA(
     assert (isinstance(x_ub, torch.Tensor))
     assert (x_lb.shape == (x_dim, ))
     assert (x_ub.shape == (x_dim, ))
-    output_lb = torch.empty(b.shape, dtype=b.dtype)
-    output_ub = torch.empty(b.shape, dtype=b.dtype)
-
-    for i in range(output_dim):
-        mask1 = torch.where(A[i] > 0)[0]
-        mask2 = torch.where(A[i] <= 0)[0]
-        output_lb[i] = A[i][mask1] @ x_lb[mask1] + A[i][mask2] @ x_ub[mask2]\
-            + b[i]
-        output_ub[i] = A[i][mask1] @ x_ub[mask1] + A[i][mask2] @ x_lb[mask2]\
-            + b[i]
+    # The positive entries of A are multiplied with the lower bound of x to
+    # get the lower bound of A * x, and the negative entries with the upper
+    # bound of x. Both bounds of x are multiplied at once so that each half
+    # of A is read only once, and b is added within the same addmm.
+    # The zero entries of A go to the non-positive half, so that their
+    # gradient is x_ub for the lower bound and x_lb for the upper bound
+    # (clamp would give them a zero gradient in both halves).
+    A_pos = torch.where(A > 0, A, torch.zeros_like(A))
+    A_neg = A - A_pos
+    # addmm does not promote mixed dtypes, compute in the dtype of A.
+    x_bounds = torch.stack((x_lb, x_ub), dim=1).to(A.dtype)
+    A_pos_x_plus_b = torch.addmm(
+        b.to(A.dtype).unsqueeze(1), A_pos, x_bounds)
+    A_neg_x = A_neg @ x_bounds
+    output_lb = A_pos_x_plus_b[:, 0] + A_neg_x[:, 1]
+    output_ub = A_pos_x_plus_b[:, 1] + A_neg_x[:, 0]
     return output_lb, output_ub
 
 
@@ -475,12 +490,13 @@ def propagate_bounds(layer, input_lo, input_up):
     assert (isinstance(input_up, torch.Tensor))
     dtype = input_lo.dtype
     if isinstance(layer, torch.nn.ReLU):
-        # ReLU is a monotonic increasing function.
-        output_lo = layer(input_lo)
-        output_up = layer(input_up)
+        # ReLU is a monotonic increasing function. Call the functional form
+        # directly to skip the nn.Module call machinery.
+        output_lo = torch.nn.functional.relu(input_lo)
+        output_up = torch.nn.functional.relu(input_up)
     elif isinstance(layer, torch.nn.LeakyReLU):
-        lo = layer(input_lo)
-        up = layer(input_up)
+        lo = torch.nn.functional.leaky_relu(input_lo, layer.negative_slope)
+        up = torch.nn.functional.leaky_relu(input_up, layer.negative_slope)
         if layer.negative_slope < 0:
             output_lo = torch.min(lo, up)
             output_lo[torch.logical_and(input_lo < 0, input_up > 0)] = 0
@@ -490,7 +506,7 @@ def propagate_bounds(layer, input_lo, input_up):
             output_up = up
     elif isinstance(layer, torch.nn.Linear):
         bias = torch.zeros((layer.out_features,), dtype=dtype) if\
-            layer.bias is None else layer.bias.clone()
+            layer.bias is None else layer.bias
         output_lo, output_up = compute_range_by_IA(layer.weight, bias,
                                                    input_lo, input_up)
     else:
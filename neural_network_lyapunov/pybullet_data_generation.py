@@ -82,14 +82,18 @@ def add_noise(x_data, noise_std_percent):
     @return x_data_, same as x_data but with noise added to it
     """
     assert (isinstance(x_data, torch.Tensor))
-    x_data_ = torch.clone(x_data)
-    noise_std = noise_std_percent * torch.mean(torch.abs(x_data), dim=0)
-    eps = torch.randn(x_data.shape, dtype=x_data.dtype)
-    x_data_ += eps * noise_std
-    return x_data_
+    noise_std = noise_std_percent * x_data.abs().mean(dim=0)
+    return x_data.clone().addcmul_(torch.randn_like(x_data), noise_std)
 
 
-def get_dataloader(x_data, x_next_data, batch_size):
+def get_dataloader(x_data,
+                   x_next_data,
+                   batch_size,
+                   num_workers=0,
+                   pin_memory=False,
+                   persistent_workers=False,
+                   prefetch_factor=2,
+                   drop_last=False):
     """
     generates a dataloader given a dataset as tensors
     @param x_data, tensor of input data to the model
@@ -97,10 +101,31 @@ def get_dataloader(x_data, x_next_data, batch_size):
     @param x_next_data, tensor of output data to the model
     [num_sample,num_channels,state size or width, nothing or height]
     @param batch_size, int
+    @param num_workers, int number of worker processes loading the batches
+    @param pin_memory, boolean set to true to return batches in page-locked
+    memory, so that they can be copied to the GPU asynchronously. Only
+    useful when training on the GPU, leave it False for CPU training
+    @param persistent_workers, boolean keep the workers alive between epochs
+    (only used if num_workers > 0)
+    @param prefetch_factor, int number of batches loaded in advance by each
+    worker (only used if num_workers > 0)
+    @param drop_last, boolean drop the last incomplete batch, so that all the
+    batches have the same shape
     @return torch DataLoaders, training dataloader and validation one
     """
     x_dataset = TensorDataset(x_data, x_next_data)
-    dataloader = DataLoader(x_dataset, batch_size=batch_size, shuffle=True)
+    if num_workers > 0:
+        worker_kwargs = dict(persistent_workers=persistent_workers,
+                             prefetch_factor=prefetch_factor)
+    else:
+        worker_kwargs = dict()
+    dataloader = DataLoader(x_dataset,
+                            batch_size=batch_size,
+                            shuffle=True,
+                            num_workers=num_workers,
+                            pin_memory=pin_memory,
+                            drop_last=drop_last,
+                            **worker_kwargs)
     return dataloader
 
 
@@ -336,13 +361,13 @@ class PybulletSampleGenerator:
             else:
                 x0 = torch.rand(self.x_dim) * (x_up - x_lo) + x_lo
             x_data_rollout, X_data_rollout = self.generate_rollout(x0, dt, N)
-            for n in range(N):
-                X_data[i * N + n, :self.num_channels, :] = X_data_rollout[n, :]
-                X_data[i * N + n,
-                       self.num_channels:, :] = X_data_rollout[n + 1, :]
-                X_next_data[i * N + n, :] = X_data_rollout[n + 2, :]
-                x_data[i * N + n, :] = x_data_rollout[n, :]
-                x_next_data[i * N + n, :] = x_data_rollout[n + 1, :]
+            X_data[i * N:(i + 1) * N, :self.num_channels, :] =\
+                X_data_rollout[:N, :]
+            X_data[i * N:(i + 1) * N, self.num_channels:, :] =\
+                X_data_rollout[1:N + 1, :]
+            X_next_data[i * N:(i + 1) * N, :] = X_data_rollout[2:, :]
+            x_data[i * N:(i + 1) * N, :] = x_data_rollout[:N, :]
+            x_next_data[i * N:(i + 1) * N, :] = x_data_rollout[1:, :]
         return x_data, x_next_data, X_data, X_next_data
 
     def data_to_rollouts(self, x_data, dt, N):
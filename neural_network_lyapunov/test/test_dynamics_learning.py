@@ -247,6 +247,16 @@ class TestDynamicsLearning(unittest.TestCase):
                 self.X_data, self.X_next_data)
             self.assertGreaterEqual(loss, 0.)
 
+    def test_reconstruction_loss(self):
+        self.opt.set_option("use_bce", False)
+        X_decoded = torch.rand(self.X_data.shape, dtype=self.opt.dtype)
+        loss = self.latent_dyn_learner.reconstruction_loss(
+            self.X_data, X_decoded)
+        # the L2 loss is averaged over the whole batch.
+        self.assertAlmostEqual(loss.item(),
+                               ((self.X_data - X_decoded)**2).mean().item())
+        self.opt.set_option("use_bce", True)
+
     def test_kl_div(self):
         z_mu = torch.zeros((5, self.opt.z_dim), dtype=self.opt.dtype)
         z_log_var = torch.log(
@@ -299,6 +309,27 @@ class TestDynamicsLearning(unittest.TestCase):
             self.assertTrue(torch.all(X0[:num_channels, :] == roll[0, :]))
             self.assertTrue(torch.all(X0[num_channels:, :] == roll[1, :]))
 
+    def test_rollout_outputs_mutable(self):
+        # The returned tensors are ordinary tensors that callers can modify
+        # in place.
+        x0 = self.x_data[0, :]
+        roll, V_roll = self.ss_dyn_learner.rollout(x0, 10)
+        roll[0] = 0.
+        V_roll[0] = 0.
+        V_roll.requires_grad_()
+        X0 = self.X_data[0, :]
+        roll, V_roll, z_roll = self.latent_dyn_learner.rollout(X0, 10)
+        roll[0] = 0.
+        V_roll[0] = 0.
+        z_roll[0] = 0.
+        rollouts = [
+            torch.rand((10, self.opt.x_dim), dtype=self.opt.dtype)
+            for i in range(4)
+        ]
+        loss = self.ss_dyn_learner.rollout_validation(rollouts)
+        loss /= len(rollouts)
+        loss.requires_grad_()
+
     def test_rollout_loss(self):
         x0 = self.x_data[0, :]
         roll, V_roll = self.ss_dyn_learner.rollout(x0, 10)
@@ -331,6 +362,10 @@ class TestDynamicsLearning(unittest.TestCase):
         ]
         loss = self.ss_dyn_learner.rollout_validation(rollouts)
         self.assertEqual(loss.shape, (10, ))
+        loss_expected = torch.sum(torch.stack(
+            [self.ss_dyn_learner.rollout_loss(r) for r in rollouts]), dim=0)
+        np.testing.assert_allclose(loss.detach().numpy(),
+                                   loss_expected.detach().numpy())
         rollouts = [
             torch.rand((10, self.X_next_data.shape[1], self.opt.image_width,
                         self.opt.image_height),
@@ -338,6 +373,10 @@ class TestDynamicsLearning(unittest.TestCase):
         ]
         loss = self.latent_dyn_learner.rollout_validation(rollouts)
         self.assertEqual(loss.shape, (10, ))
+        loss_expected = torch.sum(torch.stack(
+            [self.latent_dyn_learner.rollout_loss(r) for r in rollouts]), 0)
+        np.testing.assert_allclose(loss.detach().numpy(),
+                                   loss_expected.detach().numpy())
         if torch.cuda.is_available():
             loss_cuda = self.latent_dyn_learner.rollout_validation(
                 rollouts, device='cuda')
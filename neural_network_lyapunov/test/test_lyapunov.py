@@ -548,6 +548,16 @@ class TestLyapunovHybridSystem(unittest.TestCase):
             for i in range(lyap_val.shape[0]):
                 self.assertAlmostEqual(
                     eval_lyap(x_val[i]).item(), lyap_val[i].item())
+        # Passing a precomputed ReLU(x*) should give the same value.
+        lyap_val_given_equilibrium = dut.lyapunov_value(
+            x_val,
+            x_equilibrium,
+            V_lambda,
+            R=R,
+            relu_at_equilibrium=lyap_relu(x_equilibrium))
+        np.testing.assert_allclose(
+            lyap_val_given_equilibrium.detach().numpy(),
+            lyap_val.detach().numpy())
 
     def test_lyapunov_value(self):
         relu = setup_leaky_relu(self.system1.dtype)
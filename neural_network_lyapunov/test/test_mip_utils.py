@@ -829,6 +829,18 @@ class TestComputeRangeByIA(unittest.TestCase):
         np.testing.assert_allclose(output_ub.detach().numpy(),
                                    np.array([25, 18]))
 
+    def test_mixed_dtype(self):
+        # float32 weights with float64 bias and input bounds.
+        A = torch.tensor([[1., 2., -3.], [2., -1., -4.]], dtype=torch.float32)
+        b = torch.tensor([2., 3.], dtype=torch.float64)
+        x_lb = torch.tensor([-2., 3., -4.], dtype=torch.float64)
+        x_ub = torch.tensor([1., 5., 7.], dtype=torch.float64)
+        output_lb, output_ub = mip_utils.compute_range_by_IA(A, b, x_lb, x_ub)
+        np.testing.assert_allclose(output_lb.detach().numpy(),
+                                   np.array([-15, -34]))
+        np.testing.assert_allclose(output_ub.detach().numpy(),
+                                   np.array([25, 18]))
+
     def test_gradient(self):
         def test_fun(A_np, b_np, x_lb_np, x_ub_np):
             output_lb, output_ub = mip_utils.compute_range_by_IA(
@@ -861,6 +873,42 @@ class TestComputeRangeByIA(unittest.TestCase):
         np.testing.assert_allclose(x_lb_grad, x_lb_grad_numerical, atol=1E-6)
         np.testing.assert_allclose(x_ub_grad, x_ub_grad_numerical, atol=1E-6)
 
+    def test_gradient_zero_entries(self):
+        # A has exact zeros (as in a structured R matrix). Compare the bounds
+        # and the gradient w.r.t A against the row-by-row computation, which
+        # puts the zero entries with the non-positive ones.
+        def range_by_rows(A, b, x_lb, x_ub):
+            output_lb = []
+            output_ub = []
+            for i in range(A.shape[0]):
+                mask1 = torch.where(A[i] > 0)[0]
+                mask2 = torch.where(A[i] <= 0)[0]
+                output_lb.append(A[i][mask1] @ x_lb[mask1] +
+                                 A[i][mask2] @ x_ub[mask2] + b[i])
+                output_ub.append(A[i][mask1] @ x_ub[mask1] +
+                                 A[i][mask2] @ x_lb[mask2] + b[i])
+            return torch.stack(output_lb), torch.stack(output_ub)
+
+        dtype = torch.float64
+        A_val = torch.tensor([[0., 1., 0.], [2., -1., 0.], [0., 0., -3.]],
+                             dtype=dtype)
+        b = torch.tensor([1., -2., 0.5], dtype=dtype)
+        x_lb = torch.tensor([1., 2., -1.], dtype=dtype)
+        x_ub = torch.tensor([3., 5., 4.], dtype=dtype)
+        A = A_val.clone().requires_grad_(True)
+        output_lb, output_ub = mip_utils.compute_range_by_IA(A, b, x_lb, x_ub)
+        torch.sum(output_lb + 2 * output_ub).backward()
+        A_expected = A_val.clone().requires_grad_(True)
+        output_lb_expected, output_ub_expected = range_by_rows(
+            A_expected, b, x_lb, x_ub)
+        torch.sum(output_lb_expected + 2 * output_ub_expected).backward()
+        np.testing.assert_allclose(output_lb.detach().numpy(),
+                                   output_lb_expected.detach().numpy())
+        np.testing.assert_allclose(output_ub.detach().numpy(),
+                                   output_ub_expected.detach().numpy())
+        np.testing.assert_allclose(A.grad.numpy(), A_expected.grad.numpy())
+        self.assertEqual(A.grad[0, 0].item(), 3. + 2 * 1.)
+
 
 class TestPropagateBounds(unittest.TestCase):
     def test_relu(self):